@@ -4,9 +4,119 @@ import os
 import sqlite3
 import json
 import io
+import datetime
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import xlsxwriter
 from sqlalchemy import create_engine
 from preprocessor import SmartPreprocessor
 
+
+# pandas' default NA tokens; Arrow only nulls these in string columns when asked to
+_CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def _downcast(df):
+    # Smaller dtypes mean fewer bytes moved by every column scan in the preprocessor
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s):
+            # Non-negative columns go unsigned so the negative-value check can skip them
+            df[col] = pd.to_numeric(s, downcast="unsigned" if s.min() >= 0 else "integer")
+        elif pd.api.types.is_float_dtype(s):
+            down = pd.to_numeric(s, downcast="float")
+            if down.astype(s.dtype).equals(s):
+                df[col] = down
+        elif pd.api.types.infer_dtype(s, skipna=True) == "string":
+            if s.nunique() < 0.5 * len(s):
+                df[col] = s.astype("category")
+            else:
+                df[col] = s.astype("string[pyarrow]")
+    return df
+
+
+def _excel_cell(v, formats):
+    # Same conversions as DataFrame.to_excel: missing values are blank, infinities are
+    # the strings "inf"/"-inf", datetimes keep their time of day, and anything
+    # xlsxwriter cannot store (the nested list/dict fields) is written as its str()
+    if pd.api.types.is_scalar(v) and pd.isna(v):
+        return None, None
+    if pd.api.types.is_bool(v):
+        return bool(v), None
+    if pd.api.types.is_integer(v):
+        return int(v), None
+    if pd.api.types.is_float(v):
+        v = float(v)
+        return (v if abs(v) != float("inf") else str(v)), None
+    if isinstance(v, datetime.datetime):
+        return v, formats["datetime"]
+    if isinstance(v, datetime.date):
+        return v, None
+    if isinstance(v, datetime.timedelta):
+        return v.total_seconds() / 86400, formats["timedelta"]
+    return str(v), None
+
+
+def _write_excel(df, output):
+    # constant_memory flushes each row as soon as the next one starts, which only works
+    # when rows are written in order; DataFrame.to_excel writes column by column.
+    # The header row is left unstyled, as pandas 3 writes it (pandas 2 made it bold)
+    workbook = xlsxwriter.Workbook(output, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd",
+        "remove_timezone": True,
+    })
+    formats = {
+        "datetime": workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"}),
+        "timedelta": workbook.add_format({"num_format": "0"}),
+    }
+    sheet = workbook.add_worksheet()
+    sheet.write_row(0, 0, [str(c) for c in df.columns])
+    for r, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        for c, v in enumerate(row):
+            sheet.write(r, c, *_excel_cell(v, formats))
+    workbook.close()
+
+
+def _read_sql_chunked(query, con, chunksize=50_000):
+    # Pull the result set in chunks so the driver never buffers the whole table at once
+    return pd.concat(pd.read_sql(query, con, chunksize=chunksize), ignore_index=True)
+
+
+# Cached on the raw upload bytes so widget reruns do not re-parse the file
+@st.cache_data(show_spinner=False)
+def _load_csv(buf):
+    # Header names come from pandas so duplicate and blank ones are mangled the same
+    # way ("Phone.1", "Unnamed: 0")
+    names = pd.read_csv(io.BytesIO(buf), nrows=0).columns
+    try:
+        # Arrow parses blocks on multiple threads and keeps columns Arrow-backed
+        table = pacsv.read_csv(
+            io.BytesIO(buf),
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=64 << 20),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True, null_values=_CSV_NA_VALUES),
+        )
+    except pa.ArrowInvalid:
+        # Ragged rows, e.g. a trailing delimiter, which pandas still reads
+        return _downcast(pd.read_csv(io.BytesIO(buf)))
+    if table.num_columns != len(names):
+        return _downcast(pd.read_csv(io.BytesIO(buf)))
+    return _downcast(table.rename_columns(list(names)).to_pandas(types_mapper=pd.ArrowDtype))
+
+
+@st.cache_data(show_spinner=False)
+def _load_excel(buf):
+    return _downcast(pd.read_excel(io.BytesIO(buf), engine="calamine"))
+
+
+@st.cache_data(show_spinner=False)
+def _load_json(buf):
+    return _downcast(pd.read_json(io.BytesIO(buf)))
+
+
 st.set_page_config(page_title="SmartPreprocessor", layout="wide")
 st.title("SmartPreprocessor – Universal Healthcare CRM Data Cleaning Tool")
 
@@ -25,16 +135,16 @@ if source_type in ["CSV", "Excel", "JSON", "SQLite (.db)"]:
         ext = os.path.splitext(filename)[1]
         try:
             if source_type == "CSV":
-                df = pd.read_csv(uploaded_file)
+                df = _load_csv(uploaded_file.getvalue())
             elif source_type == "Excel":
-                df = pd.read_excel(uploaded_file)
+                df = _load_excel(uploaded_file.getvalue())
             elif source_type == "JSON":
-                df = pd.read_json(uploaded_file)
+                df = _load_json(uploaded_file.getvalue())
             elif source_type == "SQLite (.db)":
                 conn = sqlite3.connect(uploaded_file)
                 table_names = pd.read_sql("SELECT name FROM sqlite_master WHERE type='table';", conn)
                 table_to_load = st.selectbox("Select table", table_names["name"])
-                df = pd.read_sql(f"SELECT * FROM {table_to_load}", conn)
+                df = _downcast(_read_sql_chunked(f"SELECT * FROM {table_to_load}", conn))
                 conn.close()
             st.success("✅ Data loaded successfully.")
         except Exception as e:
@@ -52,7 +162,9 @@ else:
     if st.button("Connect and Load"):
         try:
             engine = create_engine(f"postgresql://{pg_user}:{pg_password}@{pg_host}:{pg_port}/{pg_db}")
-            df = pd.read_sql(f"SELECT * FROM {pg_table}", con=engine)
+            # Server-side cursor: rows are fetched per chunk instead of all up front
+            with engine.connect().execution_options(stream_results=True) as conn:
+                df = _downcast(_read_sql_chunked(f"SELECT * FROM {pg_table}", conn))
             st.success("✅ Connected and data loaded.")
         except Exception as e:
             st.error(f"❌ Connection failed: {e}")
@@ -70,10 +182,7 @@ if df is not None:
             tool.drop_empty_columns()
             tool.convert_dates()
             tool.clean_numeric_fields()
-            tool.clean_phones()
-            tool.validate_emails()
-            tool.validate_websites()
-            tool.validate_zip_codes()
+            tool.validate_all()
             tool.check_negative_values()
             tool.detect_outliers_iqr()
             tool.clean_text_columns()
@@ -99,8 +208,7 @@ if df is not None:
             )
         elif export_format == "Excel":
             output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                cleaned_df.to_excel(writer, index=False)
+            _write_excel(cleaned_df, output)
             st.download_button(
                 "📥 Download Cleaned Excel",
                 data=output.getvalue(),
@@ -1,21 +1,120 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import os
 import re
-import validators
+import warnings
 import phonenumbers
+from concurrent.futures import ThreadPoolExecutor
+
+# Copy-on-Write is always on from pandas 3.0; earlier versions need to opt in
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Surrounding whitespace is allowed by the patterns so values need no separate strip pass
+# Patterns reach pandas as .pattern strings: Arrow-backed columns on pandas 2.x
+# reject compiled regex objects
+# Python's \s spelled out: RE2, which runs the patterns on Arrow-backed columns, only
+# counts ASCII whitespace as \s, so the result would otherwise depend on the storage
+_WS = "\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+_EMAIL_RE = re.compile(f"^[{_WS}]*[^@{_WS}]+@[^@{_WS}]+\\.[^@{_WS}]+[{_WS}]*$")
+_URL_RE = re.compile(f"^[{_WS}]*https?://[^{_WS}]+\\.[^{_WS}]+[{_WS}]*$")
+# A parseable number needs a '+' with digits after it; libphonenumber accepts any
+# Unicode digit, so every non-ASCII character is let through as a possible digit
+_PHONE_PREFILTER = re.compile("[+\uFF0B][^0-9\u0080-\U0010FFFF]*[0-9\u0080-\U0010FFFF]")
+# Above this share of distinct values a direct .str check beats factorizing first
+_LUT_MAX_DISTINCT = 0.05
+_PROFILE_SAMPLE = 10_000
+# Dashed dates are read month-first, as pandas' own inference does; day-first is
+# only picked when a sampled value rules month-first out
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%d-%m-%Y", "%d-%b-%Y", "ISO8601")
+
+_COLUMN_KEYWORDS = {
+    "phone": ['phone', 'contact', 'mobile', 'cell'],
+    "email": ['email', 'e-mail'],
+    "date": ['date', 'dob', 'admission', 'discharge'],
+    "website": ['website', 'web', 'url', 'link'],
+    "zip": ['zip', 'zipcode', 'postal'],
+    "id": ['id', 'patient', 'record', 'case'],
+    "text": ['name', 'city', 'country', 'state', 'company', 'clinic', 'doctor', 'hospital'],
+}
+# One scan per column name finds every keyword; the lookahead lets matches overlap
+# ("candidate" holds both 'id' and 'date'), and no keyword prefixes one of another kind
+_KEYWORD_KIND = {k: kind for kind, keywords in _COLUMN_KEYWORDS.items() for k in keywords}
+_COL_CATEGORIZER = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_KIND)) + "))")
+
+def _fused_numeric_stats(arr, signed):
+    # Column-wise reductions over the whole numeric block at once
+    ncols = arr.shape[1]
+    if arr.size == 0:
+        return np.full(ncols, np.nan), np.full(ncols, np.nan), np.zeros(ncols, np.int64), np.zeros(ncols, np.int64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns yield NaN quartiles
+        q1, q3 = np.nanquantile(arr, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    if signed.all():
+        neg = np.count_nonzero(arr < 0, axis=0)
+    else:
+        neg = np.zeros(ncols, dtype=np.int64)
+        if signed.any():
+            neg[signed] = np.count_nonzero(arr[:, signed] < 0, axis=0)
+    out = np.count_nonzero((arr < q1 - 1.5 * iqr) | (arr > q3 + 1.5 * iqr), axis=0)
+    return q1, q3, neg, out
+
+def _to_e164(raw):
+    try:
+        parsed = phonenumbers.parse(raw, None)
+    except phonenumbers.NumberParseException:
+        return None
+    if phonenumbers.is_possible_number(parsed) and phonenumbers.is_valid_number(parsed):
+        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    return None
+
+def _is_text(s):
+    # True when the .str accessor can be used on the column
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.cat.categories
+    if s.dtype == "object":
+        return pd.api.types.infer_dtype(s, skipna=True) in ("string", "mixed", "mixed-integer")
+    return pd.api.types.is_string_dtype(s.dtype)
+
+def _as_text(s):
+    # String columns and categoricals with only string categories are used as they are;
+    # anything else, including mixed categories such as ZIPs read as ints, is cast
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        if pd.api.types.infer_dtype(s.cat.categories, skipna=True) == "string":
+            return s
+    elif s.dtype != object and pd.api.types.is_string_dtype(s.dtype):
+        return s
+    return s.astype("string")
+
+def _strip_title(s):
+    # NA-aware string dtype: the .str kernels skip missing values without a Python check
+    if s.dtype != object:
+        return s.str.strip().str.title()
+    if pd.api.types.infer_dtype(s, skipna=True) == "string":
+        return s.astype("string[pyarrow]").str.strip().str.title()
+    # Mixed columns only have their str values cleaned; everything else keeps its type
+    is_str = s.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+    out = s.copy()
+    out[is_str] = s[is_str].astype("string[pyarrow]").str.strip().str.title().to_numpy(dtype=object)
+    return out
+
+def _check_unique(s, check, distinct=0.0):
+    if distinct >= _LUT_MAX_DISTINCT:
+        return check(s).fillna(False).to_numpy(dtype=bool)
+    # Run the check on each distinct value once and broadcast through the factorized
+    # codes; the trailing False is picked up by code -1, i.e. missing values
+    codes, uniques = pd.factorize(s)
+    valid = check(pd.Series(uniques)).fillna(False).to_numpy(dtype=bool)
+    return np.append(valid, False)[codes]
 
 class SmartPreprocessor:
     def __init__(self, df):
-        self.df = df.copy()
-
-        self.phone_cols = self._match_cols(['phone', 'contact', 'mobile', 'cell'])
-        self.email_cols = self._match_cols(['email', 'e-mail'])
-        self.date_cols = self._match_cols(['date', 'dob', 'admission', 'discharge'])
-        self.website_cols = self._match_cols(['website', 'web', 'url', 'link'])
-        self.zip_cols = self._match_cols(['zip', 'zipcode', 'postal'])
-        self.id_cols = self._match_cols(['id', 'patient', 'record', 'case'])
+        # Shallow copy: columns are only duplicated when a cleaning step writes to them
+        self.df = df.copy(deep=False)
         self.numeric_cols = self.df.select_dtypes(include='number').columns.tolist()
-        self.text_cols = self._match_cols(['name', 'city', 'country', 'state', 'company', 'clinic', 'doctor', 'hospital'])
+        self._numeric_stats = None
 
         self.summary = {
             "original_shape": self.df.shape,
@@ -26,107 +125,237 @@ class SmartPreprocessor:
             "nested_fields_flagged": []
         }
 
-        # Detect nested JSON-like fields
+        # Classify every column and detect nested JSON-like fields in a single pass,
+        # lowercasing each name once
+        matched = {kind: [] for kind in _COLUMN_KEYWORDS}
         for col in self.df.columns:
-            if self.df[col].apply(lambda x: isinstance(x, dict) or isinstance(x, list)).any():
+            for kind in {_KEYWORD_KIND[k] for k in _COL_CATEGORIZER.findall(str(col).lower())}:
+                matched[kind].append(col)
+            if self.df[col].dtype == object and self.df[col].map(lambda x: isinstance(x, (dict, list))).any():
                 self.summary["nested_fields_flagged"].append(col)
 
-    def _match_cols(self, keywords):
-        return [col for col in self.df.columns if any(k in col.lower() for k in keywords)]
+        self.phone_cols = matched["phone"]
+        self.email_cols = matched["email"]
+        self.date_cols = matched["date"]
+        self.website_cols = matched["website"]
+        self.zip_cols = matched["zip"]
+        self.id_cols = matched["id"]
+        self.text_cols = matched["text"]
+
+        # Low-cardinality text and ZIP columns become categoricals, so the string
+        # steps below only touch the distinct values; the remaining all-string object
+        # columns move to Arrow storage so the .str kernels run over UTF-8 buffers.
+        # Nested and mixed-type columns stay object so no value changes type
+        low_cardinality = set(self.text_cols + self.zip_cols)
+        for col in dict.fromkeys(self.email_cols + self.website_cols + self.zip_cols + self.text_cols):
+            s = self.df[col]
+            if s.dtype != object or col in self.summary["nested_fields_flagged"]:
+                continue
+            if pd.api.types.infer_dtype(s, skipna=True) != "string":
+                continue
+            if col in low_cardinality and s.nunique(dropna=True) < 0.5 * len(s):
+                self.df[col] = s.astype("category")
+            else:
+                self.df[col] = s.astype(pd.ArrowDtype(pa.string()))
+
+        # The distinct share of a leading sample tells each validator which path to take;
+        # it is measured on the text the validators see, so nested values are hashable
+        self._distinct = {}
+        for col in dict.fromkeys(self.email_cols + self.website_cols + self.zip_cols):
+            head = _as_text(self.df[col].iloc[:_PROFILE_SAMPLE])
+            self._distinct[col] = head.nunique(dropna=True) / max(len(head), 1)
 
     def drop_empty_columns(self, threshold=0.9):
-        null_frac = self.df.isnull().mean()
-        cols_to_drop = null_frac[null_frac > threshold].index.tolist()
+        n = len(self.df)
+        if n == 0:
+            return
+        # Integer null counts from one blockwise reduction; no float mean is materialised.
+        # n * threshold can round below a whole number (0.29 * 100), so the cutoff is
+        # nudged to the largest count whose null share still does not exceed threshold
+        cutoff = int(n * threshold)
+        while cutoff < n and (cutoff + 1) / n <= threshold:
+            cutoff += 1
+        while cutoff >= 0 and cutoff / n > threshold:
+            cutoff -= 1
+        null_counts = self.df.isna().sum()
+        cols_to_drop = null_counts[null_counts > cutoff].index.tolist()
         self.df.drop(columns=cols_to_drop, inplace=True)
+        self._numeric_stats = None
         self.summary["columns_removed"] = cols_to_drop
 
+    def _sniff_date_format(self, col):
+        # Try the common export formats on a sample so the full column takes pandas' C path
+        sample = self.df[col].dropna().iloc[:100]
+        if not _is_text(sample):
+            return None
+        for fmt in _DATE_FORMATS:
+            try:
+                pd.to_datetime(sample, format=fmt, errors='raise')
+                return fmt
+            except (ValueError, TypeError):
+                continue
+        # Nothing fits: pandas infers one format for the whole column, as it always did
+        return None
+
     def convert_dates(self):
         for col in self.date_cols:
-            self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
+            fmt = self._sniff_date_format(col)
+            self.df[col] = pd.to_datetime(self.df[col], format=fmt, errors='coerce', cache=True)
 
     def clean_numeric_fields(self):
         for col in self.df.columns:
-            if self.df[col].dtype == 'object' and self.df[col].str.contains(r'\*', na=False).any():
+            if _is_text(self.df[col]) and self.df[col].str.contains('*', regex=False, na=False).any():
                 self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
         self.numeric_cols = self.df.select_dtypes(include='number').columns.tolist()
+        self._numeric_stats = None
+
+    def _run_column_checks(self, jobs):
+        # Columns are independent, so check them concurrently and merge the results serially
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            results = list(ex.map(lambda job: job[0](job[1]), jobs))
+        for col, target_col, values, stats in results:
+            self.df[target_col] = values
+            self.summary.update(stats)
+            self.summary["validations_added"].append(f"Valid {col}")
+
+    def _clean_phone_column(self, col):
+        # Without a default region libphonenumber rejects anything lacking a '+' followed
+        # by digits, so those rows are settled by one vectorised scan instead of a parse each
+        raw = self.df[col].astype("string")
+        candidate = raw.str.contains(_PHONE_PREFILTER.pattern, na=False)
+
+        # Phones repeat heavily in CRM data, so each distinct candidate is parsed once;
+        # non-candidates become NA and take code -1
+        codes, uniques = pd.factorize(raw.where(candidate))
+        uniques = np.asarray(uniques, dtype=object)
+        parsed = [_to_e164(u) for u in uniques]
+
+        # One take through the codes fills the output; the trailing None is picked up by -1
+        cleaned = pd.array(np.append(np.asarray(parsed, dtype=object), None)[codes], dtype="string")
+        invalid = int(cleaned.isna().sum())
+        return col, col, cleaned, {
+            f"Original Invalid Phones in {col}": invalid,
+            f"Remaining Invalid Phones in {col}": invalid,
+        }
+
+    def _validate_email_column(self, col):
+        raw = self.df[col]
+        s = _as_text(raw)
+        valid = _check_unique(s, lambda u: u.str.match(_EMAIL_RE.pattern, na=False),
+                              self._distinct.get(col, 0.0))
+        if raw.dtype == object and pd.api.types.infer_dtype(raw, skipna=True) != "string":
+            # Lists, dicts and other non-str cells are never emails, whatever their str() shows
+            valid &= raw.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+        invalid = int((~valid).sum())
+        return col, f"Valid {col}", valid, {
+            f"Original Invalid Emails in {col}": invalid,
+            f"Remaining Invalid Emails in {col}": invalid,
+        }
+
+    def _validate_website_column(self, col):
+        s = _as_text(self.df[col])
+        valid = _check_unique(s, lambda u: u.str.match(_URL_RE.pattern, na=False),
+                              self._distinct.get(col, 0.0))
+        invalid = int((~valid).sum())
+        return col, f"Valid {col}", valid, {
+            f"Original Invalid URLs in {col}": invalid,
+            f"Remaining Invalid URLs in {col}": invalid,
+        }
+
+    def _validate_zip_column(self, col):
+        s = _as_text(self.df[col])
+        valid = _check_unique(s, lambda u: (u.str.len() == 5) & u.str.isdecimal(),
+                              self._distinct.get(col, 0.0))
+        invalid = int((~valid).sum())
+        return col, f"Valid {col}", valid, {
+            f"Original Invalid ZIPs in {col}": invalid,
+            f"Remaining Invalid ZIPs in {col}": invalid,
+        }
 
     def clean_phones(self):
-        for col in self.phone_cols:
-            def is_invalid(val):
-                try:
-                    parsed = phonenumbers.parse(str(val), None)
-                    return not (phonenumbers.is_possible_number(parsed) and phonenumbers.is_valid_number(parsed))
-                except:
-                    return True
-
-            original_invalid = self.df[col].apply(is_invalid).sum()
-            self.df[col] = self.df[col].apply(lambda x: np.nan if is_invalid(x) else phonenumbers.format_number(phonenumbers.parse(str(x), None), phonenumbers.PhoneNumberFormat.E164) if x else np.nan)
-            remaining_invalid = self.df[col].isnull().sum()
-
-            validation_col = f"Valid {col}"
-            self.summary[f"Original Invalid Phones in {col}"] = int(original_invalid)
-            self.summary[f"Remaining Invalid Phones in {col}"] = int(remaining_invalid)
-            self.summary["validations_added"].append(validation_col)
+        self._run_column_checks([(self._clean_phone_column, col) for col in self.phone_cols])
 
     def validate_emails(self):
-        for col in self.email_cols:
-            def is_invalid(val):
-                return not validators.email(str(val).strip())
-            original_invalid = self.df[col].apply(is_invalid).sum()
-            validation_col = f"Valid {col}"
-            self.df[validation_col] = self.df[col].apply(lambda x: not is_invalid(x))
-            remaining_invalid = (~self.df[validation_col]).sum()
-
-            self.summary[f"Original Invalid Emails in {col}"] = int(original_invalid)
-            self.summary[f"Remaining Invalid Emails in {col}"] = int(remaining_invalid)
-            self.summary["validations_added"].append(validation_col)
+        self._run_column_checks([(self._validate_email_column, col) for col in self.email_cols])
 
     def validate_websites(self):
-        for col in self.website_cols:
-            original_invalid = self.df[~self.df[col].astype(str).str.startswith("http")].shape[0]
-            validation_col = f"Valid {col}"
-            self.df[validation_col] = self.df[col].apply(lambda x: validators.url(str(x).strip()))
-            remaining_invalid = (~self.df[validation_col]).sum()
-            self.summary[f"Original Invalid URLs in {col}"] = int(original_invalid)
-            self.summary[f"Remaining Invalid URLs in {col}"] = int(remaining_invalid)
-            self.summary["validations_added"].append(validation_col)
+        self._run_column_checks([(self._validate_website_column, col) for col in self.website_cols])
 
     def validate_zip_codes(self):
-        for col in self.zip_cols:
-            original_invalid = self.df[~self.df[col].astype(str).str.match(r'^\d{5}$')].shape[0]
-            validation_col = f"Valid {col}"
-            self.df[validation_col] = self.df[col].astype(str).str.match(r'^\d{5}$')
-            remaining_invalid = (~self.df[validation_col]).sum()
-            self.summary[f"Original Invalid ZIPs in {col}"] = int(original_invalid)
-            self.summary[f"Remaining Invalid ZIPs in {col}"] = int(remaining_invalid)
-            self.summary["validations_added"].append(validation_col)
+        self._run_column_checks([(self._validate_zip_column, col) for col in self.zip_cols])
+
+    def validate_all(self):
+        self._run_column_checks(
+            [(self._clean_phone_column, col) for col in self.phone_cols]
+            + [(self._validate_email_column, col) for col in self.email_cols]
+            + [(self._validate_website_column, col) for col in self.website_cols]
+            + [(self._validate_zip_column, col) for col in self.zip_cols]
+        )
+
+    def _analyze_numeric(self):
+        # One pass per column yields everything the negative and outlier checks need
+        if self._numeric_stats is None:
+            arr = self.df[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            # Unsigned columns cannot hold negatives, so their comparison is skipped
+            signed = np.array(
+                [not pd.api.types.is_unsigned_integer_dtype(self.df[c].dtype) for c in self.numeric_cols],
+                dtype=bool,
+            )
+            q1, q3, neg, out = _fused_numeric_stats(arr, signed)
+            self._numeric_stats = {
+                col: (q1[j], q3[j], int(neg[j]), int(out[j]))
+                for j, col in enumerate(self.numeric_cols)
+            }
+        return self._numeric_stats
 
     def check_negative_values(self):
-        for col in self.numeric_cols:
-            invalid_count = len(self.df[self.df[col] < 0])
+        for col, (_, _, invalid_count, _) in self._analyze_numeric().items():
             if invalid_count > 0:
-                self.summary[f"Negative Values in {col}"] = int(invalid_count)
+                self.summary[f"Negative Values in {col}"] = invalid_count
 
     def detect_outliers_iqr(self):
-        for col in self.numeric_cols:
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outlier_count = len(self.df[(self.df[col] < (Q1 - 1.5 * IQR)) | (self.df[col] > (Q3 + 1.5 * IQR))])
+        for col, (_, _, _, outlier_count) in self._analyze_numeric().items():
             if outlier_count > 0:
-                self.summary["outliers_flagged"][col] = int(outlier_count)
+                self.summary["outliers_flagged"][col] = outlier_count
 
     def clean_text_columns(self):
         for col in self.text_cols:
-            self.df[col] = self.df[col].apply(lambda x: x.strip().title() if isinstance(x, str) else x)
+            s = self.df[col]
+            if not _is_text(s):
+                continue
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                # Only the distinct categories are cleaned; rows keep their integer codes
+                cleaned = pd.Index(_strip_title(pd.Series(s.cat.categories)))
+                if cleaned.is_unique:
+                    self.df[col] = s.cat.rename_categories(cleaned)
+                else:
+                    self.df[col] = s.map(dict(zip(s.cat.categories, cleaned))).astype("category")
+                continue
+            self.df[col] = _strip_title(s)
 
-    def drop_duplicates(self):
+    def drop_duplicates(self, auto_subset=True):
         before = self.df.shape[0]
         if self.id_cols:
             self.df.drop_duplicates(subset=self.id_cols, inplace=True)
         else:
-            self.df.drop_duplicates(inplace=True)
+            # Full duplicates must already agree on any subset of columns, so only rows
+            # colliding on a narrow key get the full-row comparison. The identifying
+            # email/phone/ZIP columns make the most selective key; otherwise fall back
+            # to the columns pandas hashes in C
+            key_cols = [c for c in self.email_cols + self.phone_cols + self.zip_cols if c in self.df.columns]
+            if not auto_subset or not key_cols:
+                key_cols = self.df.columns[self.df.dtypes != object].tolist()
+            if 0 < len(key_cols) < self.df.shape[1]:
+                candidates = self.df.duplicated(subset=key_cols, keep=False).to_numpy()
+                dupes = np.zeros(len(self.df), dtype=bool)
+                dupes[candidates] = self.df[candidates].duplicated().to_numpy()
+                self.df = self.df[~dupes]
+            else:
+                self.df.drop_duplicates(inplace=True)
         after = self.df.shape[0]
+        self._numeric_stats = None
         self.summary["duplicate_rows_dropped"] = before - after
 
     def get_cleaned_data(self):